@@ -4,9 +4,106 @@ A simplified Streamlit app focused on data tables without charts
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
+import io
 import json
 import os
-from typing import Dict, Any, List
+import sys
+from functools import lru_cache
+from operator import itemgetter, methodcaller
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # fall back to the standard library parser
+    orjson = None
+
+# Business units reported in every metrics file, in display order
+BUSINESSES = ('BET NA', 'HIL', 'GROWTH MARKETS', 'PLATINUM AC-CITI', 'PLATINUM AC-JPMC', 'TIME')
+# Business columns are categorical; the categories are sorted so grouped tables keep alphabetical rows
+BUSINESS_DTYPE = pd.CategoricalDtype(sorted(BUSINESSES))
+# Choices of the sidebar business filter: 'All' plus each business
+BUSINESS_FILTER_OPTIONS = len(BUSINESSES) + 1
+
+# Metrics keys for the HC and FTE files, by figure
+HC_KEYS = {
+    'total': 'total_billable_hc',
+    'kpo': 'total_kpo_hc',
+    'non_kpo': 'total_non_kpo_hc',
+    'onsite': 'total_onsite_hc',
+    'onsite_kpo': 'onsite_kpo_hc',
+    'onsite_non_kpo': 'onsite_non_kpo_hc',
+    'offshore': 'total_offshore_hc',
+    'offshore_kpo': 'offshore_kpo_hc',
+    'offshore_non_kpo': 'offshore_non_kpo_hc',
+}
+FTE_KEYS = {
+    'total': 'total_billable_fte',
+    'kpo': 'total_kpo_fte',
+    'non_kpo': 'total_non_kpo_fte',
+    'onsite': 'total_onsite_fte',
+    'onsite_kpo': 'onsite_kpo_fte',
+    'onsite_non_kpo': 'onsite_non_kpo_fte',
+    'offshore': 'total_offshore_fte',
+    'offshore_kpo': 'offshore_kpo_fte',
+    'offshore_non_kpo': 'offshore_non_kpo_fte',
+}
+
+METRIC_KEYS = {'hc': HC_KEYS, 'fte': FTE_KEYS}
+
+# Demand pivots shown per location: (pivot column, icon, title, file/key slug)
+DEMAND_SECTIONS = (
+    ('Total', '📊', 'Total Demands', 'total'),
+    ('Filled', '✅', 'Filled Demands', 'filled'),
+    ('Open', '⏳', 'Open Demands', 'open'),
+)
+
+# Fulfillment pivot column -> field of a quarter's `kpo_demands` record
+KPO_DEMAND_FIELDS = {'Total': 'total', 'Filled': 'filled', 'Open': 'open'}
+
+# Pivot tables shown per metric, and the metrics key holding each table's KPO totals
+PIVOT_TABLES = ('Overall', 'Onsite', 'Offshore')
+KPO_KEY = {
+    (table_title, metric_key): keys[figure]
+    for metric_key, keys in (('hc', HC_KEYS), ('fte', FTE_KEYS))
+    for table_title, figure in zip(PIVOT_TABLES, ('kpo', 'onsite_kpo', 'offshore_kpo'))
+}
+
+# Tab icon for each of PIVOT_TABLES
+LOCATION_ICONS = {'Overall': '📊', 'Onsite': '🏢', 'Offshore': '🌍'}
+
+# Highlighting for the pivot tables: summary rows, the QTD column, and where the two meet
+SUMMARY_ROWS = ('VRTU', 'KPO', 'VRTU Excl KPO')
+SUMMARY_STYLE = 'background-color: #ffffcc; font-weight: bold'
+QTD_STYLE = 'background-color: #e6f3ff; font-weight: bold'
+SUMMARY_QTD_STYLE = 'background-color: #ffcccc; font-weight: bold'
+
+# Cell formatters for the styled tables, bound once instead of parsing a template string per table
+FMT_INT = "{:.0f}".format
+FMT_PCT = "{:.2f}%".format
+FMT_THOUSANDS = "{:,.2f}".format
+FULFILLMENT_FORMATS = {
+    'Total': FMT_INT,
+    'Filled': FMT_INT,
+    'Open': FMT_INT,
+    'Cancelled': FMT_INT,
+    'Expired': FMT_INT,
+    'Fulfillment_Rate': FMT_PCT,
+}
+# Client-side number formats for the highlighted pivots (applied by st.dataframe's column_config)
+COLUMN_FMT_INT = "%.0f"
+COLUMN_FMT_FLOAT = "%.2f"
+
+COMPARISON_FORMATS = {
+    'Total HC': FMT_THOUSANDS,
+    'Total FTE': FMT_THOUSANDS,
+    'Difference': FMT_THOUSANDS,
+    '% Difference': FMT_PCT,
+}
+
+# Demand counts are small whole numbers: int32 halves their footprint losslessly. HC/FTE totals stay
+# float64 - FTE figures are fractional and float32 would shift their two-decimal rounding.
+COUNT_DTYPE = np.int32
 
 # Page configuration
 st.set_page_config(
@@ -17,7 +114,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+_CSS = """
     <style>
     .main {
         padding: 0rem 1rem;
@@ -45,74 +142,127 @@ st.markdown("""
         box-shadow: 0 2px 4px rgba(0,0,0,0.1);
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
+_FOOTER_HTML = """
+    <div style='text-align: center; color: #666; padding: 20px;'>
+        <p>COO Dashboard - Workforce Metrics Analytics  </p>
+        <p>Built with Streamlit • Data updated: {}</p>
+    </div>
+    """
 
+# Emitted on every rerun: Streamlit drops elements a rerun doesn't re-emit, so gating this
+# behind session state would strip the styles from the second run onwards.
+st.markdown(_CSS, unsafe_allow_html=True)
 
-@st.cache_data(ttl=10)  # Cache for only 10 seconds to ensure fresh data
-def load_data(json_path: str) -> List[Dict[str, Any]]:
-    """Load and cache JSON data with short TTL for fresh updates."""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
 
+def _parse_json(json_path: str) -> List[Dict[str, Any]]:
+    """Parse one JSON file from a single read of its bytes."""
+    # A plain read, not mmap: the extraction job rewrites these files in place, and truncating a
+    # mapped file mid-parse raises SIGBUS and kills the server, where a short read is a JSON error
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    return json.loads(raw) if orjson is None else orjson.loads(raw)
 
-def create_business_dataframe(data: List[Dict], metric_type: str = 'hc') -> pd.DataFrame:
-    """Create a business breakdown dataframe."""
-    records = []
-    businesses = ['BET NA', 'HIL', 'GROWTH MARKETS', 'PLATINUM AC-CITI', 'PLATINUM AC-JPMC', 'TIME']
-    
-    for quarter_data in data:
-        quarter = f"{quarter_data['fiscal_year']} {quarter_data['quarter']}"
-        metrics = quarter_data.get('metrics', {})
-        
-        if not metrics:
-            continue
-        
-        if metric_type == 'hc':
-            total_key = 'total_billable_hc'
-        else:
-            total_key = 'total_billable_fte'
-        
-        for business in businesses:
-            records.append({
-                'Quarter': quarter,
-                'Business': business,
-                'Total': metrics.get(total_key, {}).get('by_business', {}).get(business, 0)
-            })
-    
-    return pd.DataFrame(records)
 
+# One entry: a data refresh changes the mtimes in the key, and the superseded copy is dropped
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_data(json_paths: tuple, mtimes: tuple) -> tuple:
+    """Load and cache the JSON files; `mtimes` is part of the cache key so edits on disk are picked up.
 
-def create_location_business_dataframe(data: List[Dict], metric_type: str = 'hc', location: str = 'onsite') -> pd.DataFrame:
-    """Create a business breakdown dataframe for specific location (onsite/offshore)."""
-    records = []
-    businesses = ['BET NA', 'HIL', 'GROWTH MARKETS', 'PLATINUM AC-CITI', 'PLATINUM AC-JPMC', 'TIME']
+    A file whose mtime is None was not found and loads as None. The parsed lists are shared
+    read-only across sessions (no copy per cache hit) - never mutate them.
+    """
+    # Parsed one after another: orjson holds the GIL while it parses, so worker threads bought nothing
+    return tuple(None if mtime is None else _parse_json(path) for path, mtime in zip(json_paths, mtimes))
+
+
+@st.cache_resource
+def _resolve_paths() -> tuple:
+    """Resolve the HC, FTE and fulfillment JSON paths once per process.
+
+    Each file is looked up in the workspace root (parent) first, where the complete/correct JSON is,
+    then in the script directory.
+    """
+    from pathlib import Path
+    script_dir = Path(__file__).resolve().parent
+    workspace_root = script_dir.parent
     
-    for quarter_data in data:
-        quarter = f"{quarter_data['fiscal_year']} {quarter_data['quarter']}"
-        metrics = quarter_data.get('metrics', {})
-        
-        if not metrics:
-            continue
-        
-        if metric_type == 'hc':
-            if location == 'onsite':
-                location_key = 'total_onsite_hc'
-            else:
-                location_key = 'total_offshore_hc'
+    paths = []
+    for file_name in ('billable_hc_metrics.json', 'billable_fte_metrics.json', 'fulfillment_metrics.json'):
+        json_path = workspace_root / file_name
+        if not json_path.exists():
+            json_path = script_dir / file_name
+        paths.append(str(json_path))
+    return tuple(paths)
+
+
+@lru_cache(maxsize=8)
+def footer_html(extraction_date: str) -> str:
+    """Footer markup for a data extraction date, formatted once per distinct date."""
+    return _FOOTER_HTML.format(extraction_date)
+
+
+def quarter_label(quarter_data: Dict) -> str:
+    """Return the "FY Qn" label for a quarter record, interned so repeated labels share one string."""
+    return sys.intern(f"{quarter_data['fiscal_year']} {quarter_data['quarter']}")
+
+
+@st.cache_data(max_entries=3)  # hc, fte, fulfillment
+def prepare_index(_data: List[Dict], metric_key: str, mtime: float) -> Tuple[List[str], Dict[str, int]]:
+    """Quarter labels of `_data` in order, and each label's position in `_data`.
+
+    Built once per file version; a repeated label points at its last record.
+    """
+    positions = {quarter_label(quarter_data): i for i, quarter_data in enumerate(_data)}
+    return list(positions), positions
+
+
+def flatten_metrics(metrics: Dict, parent: tuple = (), out: Dict = None) -> Dict[tuple, Any]:
+    """Flatten a nested metrics dict into {(key, sub_key, ...): value} so lookups take one hash."""
+    if out is None:
+        out = {}
+    
+    for key, value in metrics.items():
+        path = parent + (key,)
+        if isinstance(value, dict):
+            flatten_metrics(value, path, out)
         else:
-            if location == 'onsite':
-                location_key = 'total_onsite_fte'
-            else:
-                location_key = 'total_offshore_fte'
-        
-        for business in businesses:
-            records.append({
-                'Quarter': quarter,
-                'Business': business,
-                'Total': metrics.get(location_key, {}).get('by_business', {}).get(business, 0)
-            })
+            out[path] = value
     
-    return pd.DataFrame(records)
+    return out
+
+
+def create_tidy_dataframe(data: List[Dict], metric_type: str = 'hc') -> pd.DataFrame:
+    """Create one long Quarter/Location/Business/Total frame covering overall, onsite and offshore.
+
+    Every quarter is walked once; the per-location business tables are slices of this frame.
+    """
+    keys = HC_KEYS if metric_type == 'hc' else FTE_KEYS
+    location_keys = (keys['total'], keys['onsite'], keys['offshore'])
+    
+    quarters_with_metrics = [quarter_data for quarter_data in data if quarter_data.get('metrics')]
+    quarters = np.array([quarter_label(quarter_data) for quarter_data in quarters_with_metrics], dtype=object)
+    num_quarters, num_locations, num_businesses = len(quarters), len(PIVOT_TABLES), len(BUSINESSES)
+    
+    # quarter x location x business totals, read straight from each by_business dict
+    totals = np.empty((num_quarters, num_locations, num_businesses), dtype=np.float64)
+    for q_idx, quarter_data in enumerate(quarters_with_metrics):
+        metrics = quarter_data['metrics']
+        for l_idx, location_key in enumerate(location_keys):
+            by_business = metrics.get(location_key, {}).get('by_business', {})
+            totals[q_idx, l_idx] = np.fromiter(
+                (by_business.get(business, 0) for business in BUSINESSES), dtype=np.float64, count=num_businesses
+            )
+    
+    return pd.DataFrame({
+        'Quarter': np.repeat(quarters, num_locations * num_businesses),
+        'Location': pd.Categorical(
+            np.tile(np.repeat(np.array(PIVOT_TABLES, dtype=object), num_businesses), num_quarters),
+            categories=PIVOT_TABLES
+        ),
+        'Business': pd.Categorical(np.tile(np.array(BUSINESSES, dtype=object), num_quarters * num_locations), dtype=BUSINESS_DTYPE),
+        'Total': totals.ravel()
+    }, copy=False)
 
 
 def display_metrics_cards(quarter_data: Dict, metric_type: str = 'hc'):
@@ -123,116 +273,48 @@ def display_metrics_cards(quarter_data: Dict, metric_type: str = 'hc'):
         st.warning("⚠️ No metrics data available for the selected quarter.")
         return
     
-    if metric_type == 'hc':
-        total = metrics.get('total_billable_hc', {}).get('total', 0)
-        kpo = metrics.get('total_kpo_hc', {}).get('total', 0)
-        non_kpo = metrics.get('total_non_kpo_hc', {}).get('total', 0)
-        onsite = metrics.get('total_onsite_hc', {}).get('total', 0)
-        onsite_kpo = metrics.get('onsite_kpo_hc', {}).get('total', 0)
-        onsite_non_kpo = metrics.get('onsite_non_kpo_hc', {}).get('total', 0)
-        offshore = metrics.get('total_offshore_hc', {}).get('total', 0)
-        offshore_kpo = metrics.get('offshore_kpo_hc', {}).get('total', 0)
-        offshore_non_kpo = metrics.get('offshore_non_kpo_hc', {}).get('total', 0)
-        label = 'HC'
-    else:
-        total = metrics.get('total_billable_fte', {}).get('total', 0)
-        kpo = metrics.get('total_kpo_fte', {}).get('total', 0)
-        non_kpo = metrics.get('total_non_kpo_fte', {}).get('total', 0)
-        onsite = metrics.get('total_onsite_fte', {}).get('total', 0)
-        onsite_kpo = metrics.get('onsite_kpo_fte', {}).get('total', 0)
-        onsite_non_kpo = metrics.get('onsite_non_kpo_fte', {}).get('total', 0)
-        offshore = metrics.get('total_offshore_fte', {}).get('total', 0)
-        offshore_kpo = metrics.get('offshore_kpo_fte', {}).get('total', 0)
-        offshore_non_kpo = metrics.get('offshore_non_kpo_fte', {}).get('total', 0)
-        label = 'FTE'
-    
-    kpo_pct = (kpo / total * 100) if total > 0 else 0
-    non_kpo_pct = (non_kpo / total * 100) if total > 0 else 0
-    onsite_pct = (onsite / total * 100) if total > 0 else 0
-    offshore_pct = (offshore / total * 100) if total > 0 else 0
-    
-    # Row 1: Total, KPO, Non-KPO
-    st.markdown("### 📊 Overall Metrics")
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.metric(
-            label=f"Total Billable {label}",
-            value=f"{total:,.2f}",
-            delta=None
-        )
-    
-    with col2:
-        st.metric(
-            label=f"KPO {label}",
-            value=f"{kpo:,.2f}",
-            delta=f"{kpo_pct:.1f}%"
-        )
-    
-    with col3:
-        st.metric(
-            label=f"Non-KPO {label}",
-            value=f"{non_kpo:,.2f}",
-            delta=f"{non_kpo_pct:.1f}%"
-        )
-    
-    st.markdown("---")
-    
-    # Row 2: Onsite breakdown
-    st.markdown("### 🏢 Onsite Metrics")
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.metric(
-            label=f"Total Onsite {label}",
-            value=f"{onsite:,.2f}",
-            delta=f"{onsite_pct:.1f}% of total"
-        )
-    
-    with col2:
-        onsite_kpo_pct = (onsite_kpo / onsite * 100) if onsite > 0 else 0
-        st.metric(
-            label=f"Onsite KPO {label}",
-            value=f"{onsite_kpo:,.2f}",
-            delta=f"{onsite_kpo_pct:.1f}% of onsite"
-        )
-    
-    with col3:
-        onsite_non_kpo_pct = (onsite_non_kpo / onsite * 100) if onsite > 0 else 0
-        st.metric(
-            label=f"Onsite Non-KPO {label}",
-            value=f"{onsite_non_kpo:,.2f}",
-            delta=f"{onsite_non_kpo_pct:.1f}% of onsite"
-        )
-    
-    st.markdown("---")
-    
-    # Row 3: Offshore breakdown
-    st.markdown("### 🌍 Offshore Metrics")
-    col1, col2, col3 = st.columns(3)
+    label = 'HC' if metric_type == 'hc' else 'FTE'
+    vals = {figure: metrics.get(key, {}).get('total', 0) for figure, key in METRIC_KEYS[metric_type].items()}
     
-    with col1:
-        st.metric(
-            label=f"Total Offshore {label}",
-            value=f"{offshore:,.2f}",
-            delta=f"{offshore_pct:.1f}% of total"
-        )
-    
-    with col2:
-        offshore_kpo_pct = (offshore_kpo / offshore * 100) if offshore > 0 else 0
-        st.metric(
-            label=f"Offshore KPO {label}",
-            value=f"{offshore_kpo:,.2f}",
-            delta=f"{offshore_kpo_pct:.1f}% of offshore"
-        )
+    # Shares of total / onsite / offshore in one masked divide (0 where the denominator is 0)
+    share_of = {
+        'kpo': 'total', 'non_kpo': 'total', 'onsite': 'total', 'offshore': 'total',
+        'onsite_kpo': 'onsite', 'onsite_non_kpo': 'onsite', 'offshore_kpo': 'offshore', 'offshore_non_kpo': 'offshore'
+    }
+    nums = np.array([vals[figure] for figure in share_of], dtype=np.float64)
+    dens = np.array([vals[base] for base in share_of.values()], dtype=np.float64)
+    pcts = dict(zip(share_of, np.divide(nums, dens, out=np.zeros_like(nums), where=dens > 0) * 100))
+    
+    # One row of three cards per section: (card label, figure, delta format)
+    sections = (
+        ("### 📊 Overall Metrics", (
+            (f"Total Billable {label}", 'total', None),
+            (f"KPO {label}", 'kpo', "{:.1f}%"),
+            (f"Non-KPO {label}", 'non_kpo', "{:.1f}%"),
+        )),
+        ("### 🏢 Onsite Metrics", (
+            (f"Total Onsite {label}", 'onsite', "{:.1f}% of total"),
+            (f"Onsite KPO {label}", 'onsite_kpo', "{:.1f}% of onsite"),
+            (f"Onsite Non-KPO {label}", 'onsite_non_kpo', "{:.1f}% of onsite"),
+        )),
+        ("### 🌍 Offshore Metrics", (
+            (f"Total Offshore {label}", 'offshore', "{:.1f}% of total"),
+            (f"Offshore KPO {label}", 'offshore_kpo', "{:.1f}% of offshore"),
+            (f"Offshore Non-KPO {label}", 'offshore_non_kpo', "{:.1f}% of offshore"),
+        )),
+    )
     
-    with col3:
-        offshore_non_kpo_pct = (offshore_non_kpo / offshore * 100) if offshore > 0 else 0
-        st.metric(
-            label=f"Offshore Non-KPO {label}",
-            value=f"{offshore_non_kpo:,.2f}",
-            delta=f"{offshore_non_kpo_pct:.1f}% of offshore"
-        )
+    for i, (heading, cards) in enumerate(sections):
+        if i:
+            st.markdown("---")
+        st.markdown(heading)
+        for col, (card_label, figure, delta_format) in zip(st.columns(3), cards):
+            with col:
+                st.metric(
+                    label=card_label,
+                    value=f"{vals[figure]:,.2f}",
+                    delta=delta_format.format(pcts[figure]) if delta_format else None
+                )
 
 
 def display_growth_metrics(data: List[Dict], metric_type: str = 'hc'):
@@ -248,38 +330,20 @@ def display_growth_metrics(data: List[Dict], metric_type: str = 'hc'):
         st.warning("⚠️ Unable to calculate growth metrics - missing data")
         return
     
-    if metric_type == 'hc':
-        first_total = first.get('total_billable_hc', {}).get('total', 0)
-        last_total = last.get('total_billable_hc', {}).get('total', 0)
-        first_kpo = first.get('total_kpo_hc', {}).get('total', 0)
-        last_kpo = last.get('total_kpo_hc', {}).get('total', 0)
-        first_non_kpo = first.get('total_non_kpo_hc', {}).get('total', 0)
-        last_non_kpo = last.get('total_non_kpo_hc', {}).get('total', 0)
-        first_onsite = first.get('total_onsite_hc', {}).get('total', 0)
-        last_onsite = last.get('total_onsite_hc', {}).get('total', 0)
-        first_offshore = first.get('total_offshore_hc', {}).get('total', 0)
-        last_offshore = last.get('total_offshore_hc', {}).get('total', 0)
-        label = 'HC'
-    else:
-        first_total = first.get('total_billable_fte', {}).get('total', 0)
-        last_total = last.get('total_billable_fte', {}).get('total', 0)
-        first_kpo = first.get('total_kpo_fte', {}).get('total', 0)
-        last_kpo = last.get('total_kpo_fte', {}).get('total', 0)
-        first_non_kpo = first.get('total_non_kpo_fte', {}).get('total', 0)
-        last_non_kpo = last.get('total_non_kpo_fte', {}).get('total', 0)
-        first_onsite = first.get('total_onsite_fte', {}).get('total', 0)
-        last_onsite = last.get('total_onsite_fte', {}).get('total', 0)
-        first_offshore = first.get('total_offshore_fte', {}).get('total', 0)
-        last_offshore = last.get('total_offshore_fte', {}).get('total', 0)
-        label = 'FTE'
+    keys = METRIC_KEYS[metric_type]
+    label = 'HC' if metric_type == 'hc' else 'FTE'
+    figures = ('total', 'kpo', 'non_kpo', 'onsite', 'offshore')
+    
+    first_vals = np.array([first.get(keys[figure], {}).get('total', 0) for figure in figures], dtype=np.float64)
+    last_vals = np.array([last.get(keys[figure], {}).get('total', 0) for figure in figures], dtype=np.float64)
+    
+    # Growth % for all five metrics at once; 0 where the first quarter has no base
+    growths = np.divide(last_vals - first_vals, first_vals, out=np.zeros_like(first_vals), where=first_vals > 0) * 100
     
-    total_growth = ((last_total - first_total) / first_total * 100) if first_total > 0 else 0
-    kpo_growth = ((last_kpo - first_kpo) / first_kpo * 100) if first_kpo > 0 else 0
-    non_kpo_growth = ((last_non_kpo - first_non_kpo) / first_non_kpo * 100) if first_non_kpo > 0 else 0
-    onsite_growth = ((last_onsite - first_onsite) / first_onsite * 100) if first_onsite > 0 else 0
-    offshore_growth = ((last_offshore - first_offshore) / first_offshore * 100) if first_offshore > 0 else 0
+    last_total, last_kpo, last_non_kpo, last_onsite, last_offshore = last_vals
+    total_growth, kpo_growth, non_kpo_growth, onsite_growth, offshore_growth = growths
     
-    st.subheader(f"📈 Growth Analysis (Q1 to Q3)")
+    st.subheader("📈 Growth Analysis (Q1 to Q3)")
     
     col1, col2, col3, col4, col5 = st.columns(5)
     
@@ -321,89 +385,323 @@ def display_growth_metrics(data: List[Dict], metric_type: str = 'hc'):
 
 def create_fulfillment_dataframe(data: List[Dict]) -> pd.DataFrame:
     """Create a consolidated dataframe for fulfillment metrics."""
-    records = []
-    
-    for quarter_data in data:
-        quarter = f"{quarter_data['fiscal_year']} {quarter_data['quarter']}"
-        metrics = quarter_data.get('metrics', {})
-        
-        if not metrics:
-            continue
-        
-        records.append({
-            'Quarter': quarter,
-            'Total': metrics.get('total_demands', {}).get('total', 0),
-            'Filled': metrics.get('filled_demands', {}).get('total', 0),
-            'Open': metrics.get('open_demands', {}).get('total', 0),
-            'Cancelled': metrics.get('cancelled_demands', {}).get('total', 0),
-            'Expired': metrics.get('expired_demands', {}).get('total', 0),
-            'Fulfillment_Rate': metrics.get('fulfillment_rate', {}).get('overall', 0)
-        })
+    quarters_with_metrics = [quarter_data for quarter_data in data if quarter_data.get('metrics')]
+    columns = {
+        'metrics.total_demands.total': 'Total',
+        'metrics.filled_demands.total': 'Filled',
+        'metrics.open_demands.total': 'Open',
+        'metrics.cancelled_demands.total': 'Cancelled',
+        'metrics.expired_demands.total': 'Expired',
+        'metrics.fulfillment_rate.overall': 'Fulfillment_Rate'
+    }
     
-    return pd.DataFrame(records)
+    # Flatten every quarter in one json_normalize pass, then pick the totals; missing figures read as 0
+    flat = pd.json_normalize(quarters_with_metrics, sep='.')
+    df_fulfillment = flat.reindex(columns=list(columns)).rename(columns=columns).fillna(0).astype({
+        'Total': COUNT_DTYPE,
+        'Filled': COUNT_DTYPE,
+        'Open': COUNT_DTYPE,
+        'Cancelled': COUNT_DTYPE,
+        'Expired': COUNT_DTYPE,
+        'Fulfillment_Rate': np.float64
+    })
+    df_fulfillment.insert(0, 'Quarter', np.array([quarter_label(quarter_data) for quarter_data in quarters_with_metrics], dtype=object))
+    return df_fulfillment
+
+
+def business_positions(business_filter: Optional[str] = None) -> List[int]:
+    """Positions in BUSINESSES to build rows for: all of them, or just the filtered business."""
+    return [i for i, business in enumerate(BUSINESSES) if business_filter is None or business == business_filter]
+
+
+def build_business_frames(data: List[Dict],
+                          business_filter: Optional[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Build the overall, onsite and offshore fulfillment business frames in one pass over the quarters.
+
+    With `business_filter`, only that business's rows are built, for all three frames alike.
+    """
+    quarters_with_metrics = [quarter_data for quarter_data in data if quarter_data.get('metrics')]
+    positions = business_positions(business_filter)
+    businesses = [BUSINESSES[pos] for pos in positions]
+    num_quarters, num_businesses = len(quarters_with_metrics), len(businesses)
+    
+    # Quarters x businesses matrix per per-business figure, all filled from the same flattened quarter
+    fields = {
+        ('overall', 'Total'): ('total_demands', 'by_business'),
+        ('overall', 'Filled'): ('filled_demands', 'by_business'),
+        ('overall', 'Open'): ('open_demands', 'by_business'),
+        ('overall', 'Fulfillment_Rate'): ('fulfillment_rate', 'by_business'),
+        ('onsite', 'Total'): ('onsite_demands', 'by_business'),
+        ('onsite', 'Filled'): ('onsite_demands', 'filled_by_business'),
+        ('onsite', 'Open'): ('onsite_demands', 'open_by_business'),
+        ('offshore', 'Total'): ('offshore_demands', 'by_business'),
+        ('offshore', 'Filled'): ('offshore_demands', 'filled_by_business'),
+        ('offshore', 'Open'): ('offshore_demands', 'open_by_business'),
+    }
+    matrices = {
+        field: np.empty((num_quarters, num_businesses), dtype=np.float64 if field[1] == 'Fulfillment_Rate' else COUNT_DTYPE)
+        for field in fields
+    }
+    quarters = np.empty(num_quarters, dtype=object)
+    
+    for q_idx, quarter_data in enumerate(quarters_with_metrics):
+        quarters[q_idx] = quarter_label(quarter_data)
+        flat = flatten_metrics(quarter_data['metrics'])
+        for field, key in fields.items():
+            matrices[field][q_idx] = [flat.get((*key, business), 0) for business in businesses]
+    
+    # Onsite/offshore fulfillment rate from the location's own filled and open demands
+    for location in ('onsite', 'offshore'):
+        filled = matrices[location, 'Filled']
+        actionable = filled + matrices[location, 'Open']
+        matrices[location, 'Fulfillment_Rate'] = np.divide(
+            filled, actionable, out=np.zeros(actionable.shape), where=actionable > 0
+        ) * 100
+    
+    # Row labels match the ones these rows have in the unfiltered frame
+    row_labels = (np.arange(num_quarters)[:, None] * len(BUSINESSES) + positions).ravel()
+    quarter_col = np.repeat(quarters, num_businesses)
+    business_col = pd.Categorical(np.tile(np.array(businesses, dtype=object), num_quarters), dtype=BUSINESS_DTYPE)
+    
+    return tuple(
+        pd.DataFrame({
+            'Quarter': quarter_col,
+            'Business': business_col,
+            **{metric_col: matrices[location, metric_col].ravel()
+               for metric_col in ('Total', 'Filled', 'Open', 'Fulfillment_Rate')}
+        }, index=row_labels)
+        for location in ('overall', 'onsite', 'offshore')
+    )
+
+
+@st.cache_data(max_entries=2 + BUSINESS_FILTER_OPTIONS)  # hc, fte, fulfillment per business filter
+def precompute_tables(_data: List[Dict], metric_key: str, mtime: float,
+                      business_filter: Optional[str] = None) -> Dict[tuple, pd.DataFrame]:
+    """Build every table view for a metrics file once per file version, keyed by (metric_key, view).
+
+    HC/FTE views are Business x Quarter blocks, one per PIVOT_TABLES location.
+    `_data` is excluded from Streamlit's hashing; `metric_key` and `mtime` identify the file version.
+    `business_filter` restricts the fulfillment business views to one business as they are built.
+    """
+    if metric_key == 'fulfillment':
+        overall, onsite, offshore = build_business_frames(_data, business_filter)
+        return {
+            (metric_key, 'trends'): create_fulfillment_dataframe(_data),
+            (metric_key, 'business'): overall,
+            (metric_key, 'onsite'): onsite,
+            (metric_key, 'offshore'): offshore,
+        }
+    
+    # Business x Quarter blocks for all three locations from one groupby over the tidy frame
+    tidy = create_tidy_dataframe(_data, metric_key)
+    blocks = tidy.groupby(['Location', 'Business', 'Quarter'], observed=True)['Total'].sum().unstack('Quarter')
+    return {
+        (metric_key, location.lower()): blocks.xs(location, level='Location')
+        for location in PIVOT_TABLES
+    }
+
+
+@st.cache_data(max_entries=2)  # hc, fte
+def build_kpo_matrix(_data: List[Dict], metric_key: str, mtime: float) -> np.ndarray:
+    """Extract the KPO totals for every quarter in one go.
+
+    Rows follow PIVOT_TABLES (Overall/Onsite/Offshore KPO); columns follow the quarter order of `_data`.
+    """
+    # One C-level getter for all three KPO blocks and one for their totals. Missing blocks are
+    # pre-filled empty and missing totals read as NaN, so a gap only blanks its own table's row.
+    kpo_keys = [KPO_KEY[(table_title, metric_key)] for table_title in PIVOT_TABLES]
+    get_kpo = itemgetter(*kpo_keys)
+    get_total = methodcaller('get', 'total', np.nan)
+    missing_kpo = dict.fromkeys(kpo_keys, {})
+    return np.array([
+        [get_total(kpo) for kpo in get_kpo({**missing_kpo, **quarter_data.get('metrics', {})})]
+        for quarter_data in _data
+    ], dtype=float).reshape(len(_data), len(PIVOT_TABLES)).T
+
 
+def qtd_delta(values: np.ndarray, axis: int = -1) -> np.ndarray:
+    """QTD: change from the second-last to the last quarter along `axis`; 0 with fewer than two quarters."""
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[axis] < 2:
+        return np.zeros(np.delete(values.shape, axis))
+    return np.diff(np.take(values, [-2, -1], axis=axis), axis=axis).squeeze(axis)
 
-def create_fulfillment_business_dataframe(data: List[Dict]) -> pd.DataFrame:
-    """Create a business breakdown dataframe for fulfillment."""
-    records = []
-    businesses = ['BET NA', 'HIL', 'GROWTH MARKETS', 'PLATINUM AC-CITI', 'PLATINUM AC-JPMC', 'TIME']
+
+@st.cache_data(show_spinner=False, max_entries=2 * len(PIVOT_TABLES))  # hc, fte per location
+def build_enhanced_pivot_table(_data: List[Dict], metric_key: str, mtime: float, table_title: str) -> pd.DataFrame:
+    """Business x quarter pivot for one of PIVOT_TABLES, with VRTU, KPO, VRTU Excl KPO rows and a QTD column.
+
+    Returns the plain frame; styling is applied by the caller, once per rerun.
+    """
+    # Business x Quarter block, sorted on both axes
+    pivot_df = precompute_tables(_data, metric_key, mtime)[metric_key, table_title.lower()]
+    num_business, num_quarters = pivot_df.shape
+    
+    # KPO numbers for each quarter, from the matrix shared by all three tables
+    kpo_matrix = build_kpo_matrix(_data, metric_key, mtime)
+    kpo_values = kpo_matrix[PIVOT_TABLES.index(table_title)]
+    # Map by record position: labels are deduplicated, so zipping them with the values could misalign
+    kpo_row = {label: kpo_values[pos] for label, pos in prepare_index(_data, metric_key, mtime)[1].items()}
+    
+    # Build the whole table in one array: business rows + VRTU, KPO, VRTU Excl KPO
+    # by quarter columns + QTD
+    vals = np.zeros((num_business + 3, num_quarters + 1))
+    business_vals = vals[:num_business]
+    business_vals[:, :num_quarters] = pivot_df.to_numpy()
+    
+    # QTD - difference between last two quarters per business
+    business_vals[:, -1] = qtd_delta(business_vals[:, :num_quarters])
+    
+    # 1. VRTU - Total per quarter (and QTD) across all businesses
+    vals[num_business] = business_vals.sum(axis=0)
+    
+    # 2. KPO - KPO numbers for each quarter
+    vals[num_business + 1, :num_quarters] = [kpo_row.get(quarter, np.nan) for quarter in pivot_df.columns]
+    vals[num_business + 1, -1] = qtd_delta(kpo_values)
+    
+    # 3. VRTU Excl KPO - Total minus KPO
+    vals[num_business + 2] = vals[num_business] - vals[num_business + 1]
+    
+    return pd.DataFrame(
+        vals,
+        index=pd.Index(list(pivot_df.index) + list(SUMMARY_ROWS), name='Business'),
+        columns=pd.Index(list(pivot_df.columns) + ['QTD'], name='Quarter')
+    )
+
+
+@st.cache_data(max_entries=1)
+def build_kpo_frame(_fulfillment_data: List[Dict], mtime: float) -> pd.DataFrame:
+    """Overall KPO demand figures per quarter, indexed by "FY Qn" label.
+
+    Columns mirror the fulfillment frames (Total/Filled/Open/Fulfillment_Rate); quarters without
+    `kpo_demands` read as 0.
+    """
+    kpo_demands = [quarter_data.get('metrics', {}).get('kpo_demands', {}) for quarter_data in _fulfillment_data]
+    kpo_columns = {
+        metric_col: np.array([kpo.get(field, 0) for kpo in kpo_demands], dtype=np.int64)
+        for metric_col, field in KPO_DEMAND_FIELDS.items()
+    }
     
-    for quarter_data in data:
-        quarter = f"{quarter_data['fiscal_year']} {quarter_data['quarter']}"
-        metrics = quarter_data.get('metrics', {})
-        
-        if not metrics:
-            continue
-        
-        for business in businesses:
-            records.append({
-                'Quarter': quarter,
-                'Business': business,
-                'Total': metrics.get('total_demands', {}).get('by_business', {}).get(business, 0),
-                'Filled': metrics.get('filled_demands', {}).get('by_business', {}).get(business, 0),
-                'Open': metrics.get('open_demands', {}).get('by_business', {}).get(business, 0),
-                'Fulfillment_Rate': metrics.get('fulfillment_rate', {}).get('by_business', {}).get(business, 0)
-            })
-    
-    return pd.DataFrame(records)
-
-
-def create_fulfillment_location_business_dataframe(data: List[Dict], location: str = 'onsite') -> pd.DataFrame:
-    """Create a business breakdown dataframe for specific location (onsite/offshore) fulfillment."""
-    records = []
-    businesses = ['BET NA', 'HIL', 'GROWTH MARKETS', 'PLATINUM AC-CITI', 'PLATINUM AC-JPMC', 'TIME']
-    
-    for quarter_data in data:
-        quarter = f"{quarter_data['fiscal_year']} {quarter_data['quarter']}"
-        metrics = quarter_data.get('metrics', {})
-        
-        if not metrics:
-            continue
-        
-        location_key = 'onsite_demands' if location == 'onsite' else 'offshore_demands'
-        
-        for business in businesses:
-            # Get actual total demands by business for this location
-            total_demands = metrics.get(location_key, {}).get('by_business', {}).get(business, 0)
-            
-            # Get actual filled and open demands by business for this location
-            location_filled = metrics.get(location_key, {}).get('filled_by_business', {}).get(business, 0)
-            location_open = metrics.get(location_key, {}).get('open_by_business', {}).get(business, 0)
-            
-            # Calculate fulfillment rate
-            actionable = location_filled + location_open
-            fulfillment_rate = (location_filled / actionable * 100) if actionable > 0 else 0
-            
-            records.append({
-                'Quarter': quarter,
-                'Business': business,
-                'Total': total_demands,
-                'Filled': location_filled,
-                'Open': location_open,
-                'Fulfillment_Rate': fulfillment_rate
-            })
-    
-    return pd.DataFrame(records)
+    # The rate is derived rather than read: filled over actionable (filled + open), 0 with nothing actionable
+    actionable = kpo_columns['Filled'] + kpo_columns['Open']
+    kpo_columns['Fulfillment_Rate'] = np.divide(
+        kpo_columns['Filled'], actionable, out=np.zeros(actionable.shape), where=actionable > 0
+    ) * 100
+    
+    kpo_frame = pd.DataFrame(kpo_columns, index=[quarter_label(quarter_data) for quarter_data in _fulfillment_data])
+    # A repeated quarter label keeps its last record
+    return kpo_frame[~kpo_frame.index.duplicated(keep='last')]
+
+
+@st.cache_data(max_entries=len(PIVOT_TABLES) * BUSINESS_FILTER_OPTIONS)  # location per business filter
+def build_all_fulfillment_pivots(df: pd.DataFrame, _fulfillment_data_source: List[Dict], mtime: float,
+                                 location_type: str = 'overall') -> Dict[str, pd.DataFrame]:
+    """Pivot every fulfillment metric by business and quarter, with QTD and the VRTU / KPO / VRTU Excl KPO rows.
+
+    All metrics share one business x quarter x metric array, so the summary rows come from a single
+    reduction. `_fulfillment_data_source` is not hashed; `mtime` stands in for it in the cache key.
+    """
+    metric_cols = ['Total', 'Filled', 'Open', 'Fulfillment_Rate']
+    pivots = df.groupby(['Business', 'Quarter'], observed=True)[metric_cols].first().unstack('Quarter')
+    quarters = pivots[metric_cols[0]].columns
+    num_quarters = len(quarters)
+    
+    # business x quarter x metric, with the QTD column appended on the quarter axis
+    cube = pivots.to_numpy(dtype=np.float64).reshape(len(pivots), len(metric_cols), num_quarters).transpose(0, 2, 1)
+    cube = np.concatenate([cube, qtd_delta(cube, axis=1)[:, None, :]], axis=1)
+    
+    # Add three summary rows: VRTU, KPO, VRTU Excl KPO
+    # 1. VRTU - Total per quarter across all businesses
+    vrtu = cube.sum(axis=0)
+    
+    # 2. KPO - KPO numbers for each quarter (only for overall, not onsite); NaN for quarters without figures
+    if location_type == 'onsite':
+        kpo = np.zeros_like(vrtu)
+    else:
+        kpo_frame = build_kpo_frame(_fulfillment_data_source, mtime)
+        kpo = np.empty_like(vrtu)
+        kpo[:num_quarters] = kpo_frame.reindex(quarters)[metric_cols].to_numpy(dtype=np.float64)
+        known_kpo = np.nan_to_num(kpo[:num_quarters])
+        kpo[num_quarters] = qtd_delta(known_kpo, axis=0)
+    
+    # 3. VRTU Excl KPO - Total minus KPO (quarters without KPO figures keep the VRTU total)
+    vrtu_excl_kpo = vrtu - np.nan_to_num(kpo)
+    
+    table = np.concatenate([cube, vrtu[None], kpo[None], vrtu_excl_kpo[None]], axis=0)
+    index = pd.Index(list(pivots.index) + list(SUMMARY_ROWS), name=pivots.index.name)
+    columns = pd.Index(list(quarters) + ['QTD'], name=quarters.name)
+    
+    result = {}
+    for m, metric_col in enumerate(metric_cols):
+        values = table[:, :, m]
+        # Counts stay integer unless a missing KPO figure left a NaN in the table
+        dtype = df[metric_col].dtype if not np.isnan(values).any() else np.float64
+        result[metric_col] = pd.DataFrame(values, index=index, columns=columns).astype(dtype)
+    return result
+
+
+def highlight_summary_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Styles highlighting the summary rows (VRTU, KPO, VRTU Excl KPO) and the QTD column of a pivot."""
+    return pd.DataFrame(summary_table_styles(tuple(df.index), tuple(df.columns)), index=df.index, columns=df.columns)
+
+
+@lru_cache(maxsize=32)
+def summary_table_styles(row_labels: tuple, column_labels: tuple) -> np.ndarray:
+    """Style grid for a pivot's labels; it depends only on the labels, so pivots sharing them share one grid."""
+    is_summary = np.isin(np.array(row_labels, dtype=object), SUMMARY_ROWS)[:, None]
+    is_qtd = (np.array(column_labels, dtype=object) == 'QTD')[None, :]
+    
+    # Summary rows + QTD column (intersection) get their own color, then summary rows, then QTD
+    styles = np.where(
+        is_summary & is_qtd, SUMMARY_QTD_STYLE,
+        np.where(is_summary, SUMMARY_STYLE, np.where(is_qtd, QTD_STYLE, ''))
+    )
+    # Shared between callers, so freeze it
+    styles.flags.writeable = False
+    return styles
+
+
+def pivot_section(pivot: pd.DataFrame, title: str, number_format: str, download_label: str,
+                  file_name: str, key: str, caption: Optional[str] = None):
+    """Render a pivot under its subheader with the summary highlighting, followed by its CSV download button."""
+    st.subheader(title)
+    if caption:
+        st.caption(caption)
+    st.dataframe(
+        pivot.style.apply(highlight_summary_table, axis=None),
+        width="stretch",
+        column_config=number_columns(pivot, number_format)
+    )
+    csv_download_button(pivot, label=download_label, file_name=file_name, key=key)
+
+
+def number_columns(df: pd.DataFrame, number_format: str) -> Dict[str, Any]:
+    """column_config formatting every column of `df` as a number; the grid formats cells client-side."""
+    return {column: st.column_config.NumberColumn(format=number_format) for column in df.columns}
+
+
+@st.cache_data
+def df_to_csv_bytes(df: pd.DataFrame, index: bool = True) -> bytes:
+    """Serialize a table for st.download_button, once per unique DataFrame.
+
+    csv_download_button passes this as a deferred `data` callable, so the CSV is only built when clicked.
+    """
+    # Encode straight into a byte buffer instead of building the full str and encoding a copy of it
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=index, encoding='utf-8')
+    return buffer.getvalue()
+
+
+@st.fragment
+def csv_download_button(df: pd.DataFrame, label: str, file_name: str, key: str, index: bool = True):
+    """CSV download button for a table, run as a fragment so clicking it reruns only the button."""
+    st.download_button(
+        label=label,
+        data=lambda: df_to_csv_bytes(df, index=index),
+        file_name=file_name,
+        mime="text/csv",
+        key=key
+    )
 
 
 def display_fulfillment_metrics_cards(quarter_data: Dict):
@@ -459,7 +757,6 @@ def display_fulfillment_metrics_cards(quarter_data: Dict):
         )
     
     with col6:
-        onsite = metrics.get('onsite_demands', {}).get('total', 0)
         offshore = metrics.get('offshore_demands', {}).get('total', 0)
         offshore_pct = (offshore / total * 100) if total > 0 else 0
         st.metric(
@@ -482,37 +779,25 @@ def main():
     st.sidebar.title("📌 Dashboard Controls")
     st.sidebar.markdown("---")
     
-    # File paths - resolve from workspace root (parent) first, then script directory
-    from pathlib import Path
-    script_dir = Path(__file__).resolve().parent
-    workspace_root = script_dir.parent
-    
-    # Try workspace root first (where the complete/correct JSON is), then script directory
-    hc_json_path = workspace_root / 'billable_hc_metrics.json'
-    if not hc_json_path.exists():
-        hc_json_path = script_dir / 'billable_hc_metrics.json'
-    
-    fte_json_path = workspace_root / 'billable_fte_metrics.json'
-    if not fte_json_path.exists():
-        fte_json_path = script_dir / 'billable_fte_metrics.json'
-    
-    fulfillment_json_path = workspace_root / 'fulfillment_metrics.json'
-    if not fulfillment_json_path.exists():
-        fulfillment_json_path = script_dir / 'fulfillment_metrics.json'
-    
-    hc_json_path = str(hc_json_path)
-    fte_json_path = str(fte_json_path)
-    fulfillment_json_path = str(fulfillment_json_path)
+    hc_json_path, fte_json_path, fulfillment_json_path = _resolve_paths()
     
     # Load data
     try:
-        hc_data = load_data(hc_json_path)
-        fte_data = load_data(fte_json_path)
+        hc_mtime = os.path.getmtime(hc_json_path)
+        fte_mtime = os.path.getmtime(fte_json_path)
+        
+        # Fulfillment data is optional
+        try:
+            fulfillment_mtime = os.path.getmtime(fulfillment_json_path)
+        except OSError:
+            fulfillment_mtime = None
+        
+        hc_data, fte_data, fulfillment_data = load_data(
+            (hc_json_path, fte_json_path, fulfillment_json_path),
+            (hc_mtime, fte_mtime, fulfillment_mtime)
+        )
         
-        # Load fulfillment data if available
-        fulfillment_data = None
-        if os.path.exists(fulfillment_json_path):
-            fulfillment_data = load_data(fulfillment_json_path)
+        if fulfillment_data is not None:
             st.sidebar.success("✅ All data loaded successfully (HC, FTE, Fulfillment)")
         else:
             st.sidebar.success("✅ HC and FTE data loaded successfully")
@@ -545,36 +830,39 @@ def main():
     # Quarter selector
     if metric_type == 'Headcount (HC)':
         data = hc_data
+        data_mtime = hc_mtime
         label = 'HC'
         metric_key = 'hc'
     elif metric_type == 'Full-Time Equivalent (FTE)':
         data = fte_data
+        data_mtime = fte_mtime
         label = 'FTE'
         metric_key = 'fte'
     elif metric_type == 'Fulfillment Metrics':
         data = fulfillment_data if fulfillment_data else hc_data
+        data_mtime = fulfillment_mtime if fulfillment_data else hc_mtime
         label = 'Fulfillment'
         metric_key = 'fulfillment'
     else:
         data = hc_data
+        data_mtime = hc_mtime
         label = 'HC'
         metric_key = 'hc'
     
     if metric_type not in ['HC vs FTE Comparison', 'Fulfillment Metrics']:
-        quarters = [f"{q['fiscal_year']} {q['quarter']}" for q in data]
-        selected_quarter = st.sidebar.selectbox("Select Quarter for Detailed View", quarters, index=len(quarters)-1, key="quarter_hc_fte")
-        selected_quarter_data = [q for q in data if f"{q['fiscal_year']} {q['quarter']}" == selected_quarter][0]
+        quarters = prepare_index(data, metric_key, data_mtime)[0]
+        st.sidebar.selectbox("Select Quarter for Detailed View", quarters, index=len(quarters)-1, key="quarter_hc_fte")
     elif metric_type == 'Fulfillment Metrics' and fulfillment_data:
-        quarters = [f"{q['fiscal_year']} {q['quarter']}" for q in fulfillment_data]
-        selected_quarter = st.sidebar.selectbox("Select Quarter for Detailed View", quarters, index=len(quarters)-1, key="quarter_fulfillment")
-        selected_quarter_data = [q for q in fulfillment_data if f"{q['fiscal_year']} {q['quarter']}" == selected_quarter][0]
+        quarters = prepare_index(fulfillment_data, 'fulfillment', fulfillment_mtime)[0]
+        st.sidebar.selectbox("Select Quarter for Detailed View", quarters, index=len(quarters)-1, key="quarter_fulfillment")
     
     # Business selector
-    businesses = ['All', 'BET NA', 'HIL', 'GROWTH MARKETS', 'PLATINUM AC-CITI', 'PLATINUM AC-JPMC', 'TIME']
-    selected_business = st.sidebar.selectbox("Filter by Business", businesses, index=0, key="business_filter")
+    selected_business = st.sidebar.selectbox("Filter by Business", ['All', *BUSINESSES], index=0, key="business_filter")
     
     st.sidebar.markdown("---")
-    st.sidebar.info(f"📅 Last Updated: {data[0]['extraction_date']}")
+    # Read once per run; the footer reuses it without going back to the quarter list
+    extraction_date = data[0]['extraction_date']
+    st.sidebar.info(f"📅 Last Updated: {extraction_date}")
     
     # Main content
     if metric_type == 'HC vs FTE Comparison':
@@ -583,40 +871,44 @@ def main():
         # Comparison table
         st.subheader("📋 Detailed Comparison Table")
         
-        comparison_records = []
-        for i, hc_quarter in enumerate(hc_data):
-            if i < len(fte_data):
-                hc_metrics = hc_quarter.get('metrics', {})
-                fte_metrics = fte_data[i].get('metrics', {})
-                
-                if not hc_metrics or not fte_metrics:
-                    continue
-                
-                quarter = f"{hc_quarter['fiscal_year']} {hc_quarter['quarter']}"
-                hc_total = hc_metrics.get('total_billable_hc', {}).get('total', 0)
-                fte_total = fte_metrics.get('total_billable_fte', {}).get('total', 0)
-                diff = hc_total - fte_total
-                pct_diff = (diff / hc_total * 100) if hc_total > 0 else 0
-                
-                comparison_records.append({
-                    'Quarter': quarter,
-                    'Total HC': f"{hc_total:,.2f}",
-                    'Total FTE': f"{fte_total:,.2f}",
-                    'Difference': f"{diff:,.2f}",
-                    '% Difference': f"{pct_diff:.2f}%"
-                })
+        # Quarters where both files carry metrics; totals go straight into arrays
+        pairs = [
+            (hc_quarter, fte_quarter) for hc_quarter, fte_quarter in zip(hc_data, fte_data)
+            if hc_quarter.get('metrics') and fte_quarter.get('metrics')
+        ]
+        quarters = [quarter_label(hc_quarter) for hc_quarter, _ in pairs]
+        hc_totals = np.fromiter(
+            (hc_quarter['metrics'].get(HC_KEYS['total'], {}).get('total', 0) for hc_quarter, _ in pairs),
+            dtype=np.float64, count=len(pairs)
+        )
+        fte_totals = np.fromiter(
+            (fte_quarter['metrics'].get(FTE_KEYS['total'], {}).get('total', 0) for _, fte_quarter in pairs),
+            dtype=np.float64, count=len(pairs)
+        )
         
-        comparison_df = pd.DataFrame(comparison_records)
-        st.dataframe(comparison_df, use_container_width=True, hide_index=True)
+        # Differences and % of HC for every quarter at once (0% where HC is 0)
+        diffs = hc_totals - fte_totals
+        pct_diffs = np.divide(diffs, hc_totals, out=np.zeros_like(diffs), where=hc_totals > 0) * 100
+        
+        # Keep the columns numeric so the table sorts and the CSV holds numbers; format only for display.
+        # The derived columns are rounded to the displayed precision to keep float noise out of the CSV.
+        comparison_df = pd.DataFrame({
+            'Quarter': quarters,
+            'Total HC': hc_totals,
+            'Total FTE': fte_totals,
+            'Difference': diffs.round(2),
+            '% Difference': pct_diffs.round(2)
+        })
+        styled_comparison = comparison_df.style.format(COMPARISON_FORMATS)
+        st.dataframe(styled_comparison, width="stretch", hide_index=True)
         
         # Download button
-        csv_comparison = comparison_df.to_csv(index=False)
-        st.download_button(
+        csv_download_button(
+            comparison_df,
             label="📥 Download HC vs FTE Comparison as CSV",
-            data=csv_comparison,
             file_name="hc_vs_fte_comparison.csv",
-            mime="text/csv",
-            key="download_hc_vs_fte"
+            key="download_hc_vs_fte",
+            index=False
         )
         
     elif metric_type in ['Headcount (HC)', 'Full-Time Equivalent (FTE)']:
@@ -624,237 +916,73 @@ def main():
         st.header("📋 Data Tables by Business Unit")
         st.markdown("Comprehensive breakdown showing Overall, Onsite, and Offshore metrics across all business units")
         
-        # Create dataframes for all three categories
-        df_business_overall = create_business_dataframe(data, metric_key)
-        df_business_onsite = create_location_business_dataframe(data, metric_key, 'onsite')
-        df_business_offshore = create_location_business_dataframe(data, metric_key, 'offshore')
-        
-        # Helper function to create pivot table with summary rows and QTD
-        def create_enhanced_pivot_table(df_business_data, data_source, metric_key, table_title):
-            """Create a pivot table with VRTU, KPO, VRTU Excl KPO rows and QTD column."""
-            
-            # Create pivot table
-            pivot_df = df_business_data.pivot(index='Business', columns='Quarter', values='Total')
-            
-            # Calculate QTD - difference between last two quarters per business
-            qtd_values = []
-            num_quarters = len(pivot_df.columns)
-            
-            if num_quarters >= 2:
-                last_quarter = pivot_df.columns[-1]
-                second_last_quarter = pivot_df.columns[-2]
-                
-                for business in pivot_df.index:
-                    qtd_diff = pivot_df.loc[business, last_quarter] - pivot_df.loc[business, second_last_quarter]
-                    qtd_values.append(qtd_diff)
-            else:
-                qtd_values = [0] * len(pivot_df.index)
-            
-            pivot_df['QTD'] = qtd_values
-            
-            # Add three summary rows
-            # 1. VRTU - Total per quarter across all businesses
-            vrtu_row = {}
-            for col in pivot_df.columns:
-                if col == 'QTD':
-                    vrtu_row[col] = sum(qtd_values) if num_quarters >= 2 else 0
-                else:
-                    vrtu_row[col] = pivot_df[col].sum()
-            
-            # 2. KPO - KPO numbers for each quarter
-            kpo_row = {}
-            kpo_values_list = []
-            
-            if table_title == "Overall":
-                for quarter_data in data_source:
-                    quarter = f"{quarter_data['fiscal_year']} {quarter_data['quarter']}"
-                    if metric_key == 'hc':
-                        kpo_val = quarter_data['metrics']['total_kpo_hc']['total']
-                    else:
-                        kpo_val = quarter_data['metrics']['total_kpo_fte']['total']
-                    kpo_row[quarter] = kpo_val
-                    kpo_values_list.append(kpo_val)
-                
-                if len(kpo_values_list) >= 2:
-                    kpo_row['QTD'] = kpo_values_list[-1] - kpo_values_list[-2]
-                else:
-                    kpo_row['QTD'] = 0
-            elif table_title == "Onsite":
-                # For Onsite, use onsite_kpo values
-                for quarter_data in data_source:
-                    quarter = f"{quarter_data['fiscal_year']} {quarter_data['quarter']}"
-                    if metric_key == 'hc':
-                        kpo_val = quarter_data['metrics']['onsite_kpo_hc']['total']
-                    else:
-                        kpo_val = quarter_data['metrics']['onsite_kpo_fte']['total']
-                    kpo_row[quarter] = kpo_val
-                    kpo_values_list.append(kpo_val)
-                
-                if len(kpo_values_list) >= 2:
-                    kpo_row['QTD'] = kpo_values_list[-1] - kpo_values_list[-2]
-                else:
-                    kpo_row['QTD'] = 0
-            elif table_title == "Offshore":
-                # For Offshore, use offshore_kpo values
-                for quarter_data in data_source:
-                    quarter = f"{quarter_data['fiscal_year']} {quarter_data['quarter']}"
-                    if metric_key == 'hc':
-                        kpo_val = quarter_data['metrics']['offshore_kpo_hc']['total']
-                    else:
-                        kpo_val = quarter_data['metrics']['offshore_kpo_fte']['total']
-                    kpo_row[quarter] = kpo_val
-                    kpo_values_list.append(kpo_val)
-                
-                if len(kpo_values_list) >= 2:
-                    kpo_row['QTD'] = kpo_values_list[-1] - kpo_values_list[-2]
-                else:
-                    kpo_row['QTD'] = 0
-            
-            # 3. VRTU Excl KPO - Total minus KPO
-            vrtu_excl_kpo_row = {}
-            for quarter in pivot_df.columns:
-                if quarter == 'QTD':
-                    vrtu_excl_kpo_row[quarter] = vrtu_row[quarter] - kpo_row[quarter]
-                elif quarter in kpo_row:
-                    vrtu_excl_kpo_row[quarter] = vrtu_row[quarter] - kpo_row[quarter]
-            
-            # Add the summary rows to the dataframe
-            pivot_df.loc['VRTU'] = pd.Series(vrtu_row)
-            pivot_df.loc['KPO'] = pd.Series(kpo_row)
-            pivot_df.loc['VRTU Excl KPO'] = pd.Series(vrtu_excl_kpo_row)
-            
-            return pivot_df
-        
-        # Helper function for styling
-        def highlight_pivot_table(df):
-            """Apply highlighting to summary rows and QTD column."""
-            styles = pd.DataFrame('', index=df.index, columns=df.columns)
-            
-            # Highlight summary rows (last 3 rows)
-            summary_rows = ['VRTU', 'KPO', 'VRTU Excl KPO']
-            for row in summary_rows:
-                if row in df.index:
-                    styles.loc[row, :] = 'background-color: #ffffcc; font-weight: bold'
-            
-            # Highlight QTD column for all rows
-            if 'QTD' in df.columns:
-                styles['QTD'] = 'background-color: #e6f3ff; font-weight: bold'
-            
-            # For summary rows + QTD column (intersection), use a different color
-            for row in summary_rows:
-                if row in df.index and 'QTD' in df.columns:
-                    styles.loc[row, 'QTD'] = 'background-color: #ffcccc; font-weight: bold'
-            
-            return styles
-        
-        # Table 1: Overall Numbers
+        # One tab per location; only the selected tab's table is built and sent
         st.markdown("---")
-        st.subheader(f"📊 Overall {label} by Business Unit")
-        st.caption("Total billable headcount/FTE across all locations")
-        
-        pivot_overall = create_enhanced_pivot_table(df_business_overall, data, metric_key, "Overall")
-        styled_overall = pivot_overall.style.format("{:.2f}")
-        styled_overall = styled_overall.apply(lambda x: highlight_pivot_table(pivot_overall), axis=None)
-        st.dataframe(styled_overall, use_container_width=True)
-        
-        csv_overall = pivot_overall.to_csv()
-        st.download_button(
-            label=f"📥 Download Overall {label} Data as CSV",
-            data=csv_overall,
-            file_name=f"{metric_key}_overall_business_metrics.csv",
-            mime="text/csv",
-            key=f"download_overall_{metric_key}"
+        location_tabs = st.tabs(
+            [f"{LOCATION_ICONS[table_title]} {table_title}" for table_title in PIVOT_TABLES],
+            key=f"{metric_key}_location_tab", on_change="rerun"
         )
-        
-        # Table 2: Onsite Numbers
-        st.markdown("---")
-        st.subheader(f"🏢 Onsite {label} by Business Unit")
-        st.caption("Onsite workforce metrics by business unit")
-        
-        pivot_onsite = create_enhanced_pivot_table(df_business_onsite, data, metric_key, "Onsite")
-        styled_onsite = pivot_onsite.style.format("{:.2f}")
-        styled_onsite = styled_onsite.apply(lambda x: highlight_pivot_table(pivot_onsite), axis=None)
-        st.dataframe(styled_onsite, use_container_width=True)
-        
-        csv_onsite = pivot_onsite.to_csv()
-        st.download_button(
-            label=f"📥 Download Onsite {label} Data as CSV",
-            data=csv_onsite,
-            file_name=f"{metric_key}_onsite_business_metrics.csv",
-            mime="text/csv",
-            key=f"download_onsite_{metric_key}"
+        captions = (
+            "Total billable headcount/FTE across all locations",
+            "Onsite workforce metrics by business unit",
+            "Offshore workforce metrics by business unit",
         )
         
-        # Table 3: Offshore Numbers
-        st.markdown("---")
-        st.subheader(f"🌍 Offshore {label} by Business Unit")
-        st.caption("Offshore workforce metrics by business unit")
-        
-        pivot_offshore = create_enhanced_pivot_table(df_business_offshore, data, metric_key, "Offshore")
-        styled_offshore = pivot_offshore.style.format("{:.2f}")
-        styled_offshore = styled_offshore.apply(lambda x: highlight_pivot_table(pivot_offshore), axis=None)
-        st.dataframe(styled_offshore, use_container_width=True)
-        
-        csv_offshore = pivot_offshore.to_csv()
-        st.download_button(
-            label=f"📥 Download Offshore {label} Data as CSV",
-            data=csv_offshore,
-            file_name=f"{metric_key}_offshore_business_metrics.csv",
-            mime="text/csv",
-            key=f"download_offshore_{metric_key}"
-        )
+        for location_tab, table_title, caption in zip(location_tabs, PIVOT_TABLES, captions):
+            if not location_tab.open:
+                continue
+            with location_tab:
+                pivot_section(
+                    build_enhanced_pivot_table(data, metric_key, data_mtime, table_title),
+                    title=f"{LOCATION_ICONS[table_title]} {table_title} {label} by Business Unit",
+                    number_format=COLUMN_FMT_FLOAT,
+                    download_label=f"📥 Download {table_title} {label} Data as CSV",
+                    file_name=f"{metric_key}_{table_title.lower()}_business_metrics.csv",
+                    key=f"download_{table_title.lower()}_{metric_key}",
+                    caption=caption
+                )
     
     if metric_type == 'Fulfillment Metrics' and fulfillment_data:
         st.header("📊 Fulfillment Metrics - Demand & Resource Allocation")
         
+        fulfillment_tables = precompute_tables(
+            fulfillment_data, 'fulfillment', fulfillment_mtime,
+            business_filter=None if selected_business == 'All' else selected_business
+        )
+        
         st.markdown("---")
         
         # Fulfillment summary table
         st.subheader("📋 Fulfillment Trends Table")
-        df_fulfillment = create_fulfillment_dataframe(fulfillment_data)
+        df_fulfillment = fulfillment_tables['fulfillment', 'trends']
         
-        st.dataframe(df_fulfillment.style.format({
-            'Total': '{:.0f}',
-            'Filled': '{:.0f}',
-            'Open': '{:.0f}',
-            'Cancelled': '{:.0f}',
-            'Expired': '{:.0f}',
-            'Fulfillment_Rate': '{:.2f}%'
-        }), use_container_width=True)
+        st.dataframe(df_fulfillment.style.format(FULFILLMENT_FORMATS), width="stretch")
         
-        csv_fulfillment = df_fulfillment.to_csv(index=False)
-        st.download_button(
+        csv_download_button(
+            df_fulfillment,
             label="📥 Download Fulfillment Trends as CSV",
-            data=csv_fulfillment,
             file_name="fulfillment_trends.csv",
-            mime="text/csv",
-            key="download_fulfillment_trends"
+            key="download_fulfillment_trends",
+            index=False
         )
         
         st.markdown("---")
         
         # Business breakdown
         st.header("🏢 Fulfillment by Business Unit")
-        df_business_fulfillment = create_fulfillment_business_dataframe(fulfillment_data)
-        
-        if selected_business != 'All':
-            df_business_fulfillment = df_business_fulfillment[df_business_fulfillment['Business'] == selected_business]
+        df_business_fulfillment = fulfillment_tables['fulfillment', 'business']
         
         st.subheader("Fulfillment Metrics by Business")
-        st.dataframe(df_business_fulfillment.style.format({
-            'Total': '{:.0f}',
-            'Filled': '{:.0f}',
-            'Open': '{:.0f}',
-            'Fulfillment_Rate': '{:.2f}%'
-        }), use_container_width=True)
+        st.dataframe(df_business_fulfillment.style.format(
+            {col: FULFILLMENT_FORMATS[col] for col in ('Total', 'Filled', 'Open', 'Fulfillment_Rate')}
+        ), width="stretch")
         
-        csv_business = df_business_fulfillment.to_csv(index=False)
-        st.download_button(
+        csv_download_button(
+            df_business_fulfillment,
             label="📥 Download Business Fulfillment as CSV",
-            data=csv_business,
             file_name="fulfillment_by_business.csv",
-            mime="text/csv",
-            key="download_business_fulfillment"
+            key="download_business_fulfillment",
+            index=False
         )
         
         st.markdown("---")
@@ -862,287 +990,70 @@ def main():
         # Detailed tables
         st.header("📋 Detailed Fulfillment Data by Business Unit")
         
-        # Create pivot tables for different metrics
-        def create_fulfillment_pivot(df, metric_col, title, fulfillment_data_source, location_type='overall'):
-            pivot = df.pivot(index='Business', columns='Quarter', values=metric_col)
-            
-            # Add QTD column
-            if len(pivot.columns) >= 2:
-                pivot['QTD'] = pivot.iloc[:, -1] - pivot.iloc[:, -2]
-            else:
-                pivot['QTD'] = 0
-            
-            # Add three summary rows: VRTU, KPO, VRTU Excl KPO
-            # 1. VRTU - Total per quarter across all businesses
-            vrtu_row = {}
-            for col in pivot.columns:
-                if col == 'QTD':
-                    vrtu_row[col] = pivot['QTD'].sum()
-                else:
-                    vrtu_row[col] = pivot[col].sum()
-            
-            # 2. KPO - KPO numbers for each quarter (only for overall, not onsite)
-            kpo_row = {}
-            if location_type == 'onsite':
-                # For onsite, don't show KPO data - set all to 0
-                for col in pivot.columns:
-                    kpo_row[col] = 0
-            else:
-                for quarter_data in fulfillment_data_source:
-                    quarter = f"{quarter_data['fiscal_year']} {quarter_data['quarter']}"
-                    if quarter in pivot.columns:
-                        kpo_val = 0
-                        
-                        # Use overall kpo_demands for overall tables
-                        if 'kpo_demands' in quarter_data['metrics']:
-                            if metric_col == 'Total':
-                                kpo_val = quarter_data['metrics']['kpo_demands']['total']
-                            elif metric_col == 'Filled':
-                                kpo_val = quarter_data['metrics']['kpo_demands']['filled']
-                            elif metric_col == 'Open':
-                                kpo_val = quarter_data['metrics']['kpo_demands']['open']
-                            elif metric_col == 'Fulfillment_Rate':
-                                # Calculate KPO fulfillment rate
-                                kpo_filled = quarter_data['metrics']['kpo_demands']['filled']
-                                kpo_open = quarter_data['metrics']['kpo_demands']['open']
-                                kpo_actionable = kpo_filled + kpo_open
-                                kpo_val = (kpo_filled / kpo_actionable * 100) if kpo_actionable > 0 else 0
-                        
-                        kpo_row[quarter] = kpo_val
-            
-            # Calculate KPO QTD
-            kpo_quarters = [q for q in pivot.columns if q != 'QTD']
-            if len(kpo_quarters) >= 2:
-                last_q = kpo_quarters[-1]
-                second_last_q = kpo_quarters[-2]
-                kpo_row['QTD'] = kpo_row.get(last_q, 0) - kpo_row.get(second_last_q, 0)
-            else:
-                kpo_row['QTD'] = 0
-            
-            # 3. VRTU Excl KPO - Total minus KPO
-            vrtu_excl_kpo_row = {}
-            for quarter in pivot.columns:
-                if quarter in kpo_row:
-                    vrtu_excl_kpo_row[quarter] = vrtu_row[quarter] - kpo_row[quarter]
-                else:
-                    vrtu_excl_kpo_row[quarter] = vrtu_row[quarter]
-            
-            # Add the summary rows to the dataframe
-            pivot.loc['VRTU'] = pd.Series(vrtu_row)
-            pivot.loc['KPO'] = pd.Series(kpo_row)
-            pivot.loc['VRTU Excl KPO'] = pd.Series(vrtu_excl_kpo_row)
-            
-            return pivot
-        
-        # Helper function for highlighting fulfillment tables
-        def highlight_fulfillment_table(df):
-            """Apply highlighting to summary rows (VRTU, KPO, VRTU Excl KPO) and QTD column."""
-            styles = pd.DataFrame('', index=df.index, columns=df.columns)
-            
-            # Highlight summary rows (last 3 rows)
-            summary_rows = ['VRTU', 'KPO', 'VRTU Excl KPO']
-            for row in summary_rows:
-                if row in df.index:
-                    styles.loc[row, :] = 'background-color: #ffffcc; font-weight: bold'
-            
-            # Highlight QTD column for all rows
-            if 'QTD' in df.columns:
-                styles['QTD'] = 'background-color: #e6f3ff; font-weight: bold'
-            
-            # For summary rows + QTD column (intersection), use a different color
-            for row in summary_rows:
-                if row in df.index and 'QTD' in df.columns:
-                    styles.loc[row, 'QTD'] = 'background-color: #ffcccc; font-weight: bold'
-            
-            return styles
-        
-        # Total Demands Table
-        st.subheader("📊 Total Demands by Business")
-        pivot_total = create_fulfillment_pivot(df_business_fulfillment, 'Total', 'Total Demands', fulfillment_data)
-        styled_total = pivot_total.style.format("{:.0f}")
-        styled_total = styled_total.apply(lambda x: highlight_fulfillment_table(pivot_total), axis=None)
-        st.dataframe(styled_total, use_container_width=True)
-        
-        csv_total = pivot_total.to_csv()
-        st.download_button(
-            label="📥 Download Total Demands as CSV",
-            data=csv_total,
-            file_name="fulfillment_total_demands.csv",
-            mime="text/csv",
-            key="download_total_demands"
-        )
-        
-        # Filled Demands Table
-        st.markdown("---")
-        st.subheader("✅ Filled Demands by Business")
-        pivot_filled = create_fulfillment_pivot(df_business_fulfillment, 'Filled', 'Filled Demands', fulfillment_data)
-        styled_filled = pivot_filled.style.format("{:.0f}")
-        styled_filled = styled_filled.apply(lambda x: highlight_fulfillment_table(pivot_filled), axis=None)
-        st.dataframe(styled_filled, use_container_width=True)
-        
-        csv_filled = pivot_filled.to_csv()
-        st.download_button(
-            label="📥 Download Filled Demands as CSV",
-            data=csv_filled,
-            file_name="fulfillment_filled_demands.csv",
-            mime="text/csv",
-            key="download_filled_demands"
+        # Only the selected tab's pivots are built and sent
+        overall_tab, onsite_tab, offshore_tab = st.tabs(
+            [f"{LOCATION_ICONS[table_title]} {table_title}" for table_title in PIVOT_TABLES],
+            key="fulfillment_location_tab", on_change="rerun"
         )
         
-        # Open Demands Table
-        st.markdown("---")
-        st.subheader("⏳ Open Demands by Business")
-        pivot_open = create_fulfillment_pivot(df_business_fulfillment, 'Open', 'Open Demands', fulfillment_data)
-        styled_open = pivot_open.style.format("{:.0f}")
-        styled_open = styled_open.apply(lambda x: highlight_fulfillment_table(pivot_open), axis=None)
-        st.dataframe(styled_open, use_container_width=True)
-        
-        csv_open = pivot_open.to_csv()
-        st.download_button(
-            label="📥 Download Open Demands as CSV",
-            data=csv_open,
-            file_name="fulfillment_open_demands.csv",
-            mime="text/csv",
-            key="download_open_demands"
-        )
-        
-        # Fulfillment Rate Table
-        st.markdown("---")
-        st.subheader("📊 Fulfillment Rate (%) by Business")
-        pivot_rate = create_fulfillment_pivot(df_business_fulfillment, 'Fulfillment_Rate', 'Fulfillment Rate', fulfillment_data)
-        styled_rate = pivot_rate.style.format("{:.2f}")
-        styled_rate = styled_rate.apply(lambda x: highlight_fulfillment_table(pivot_rate), axis=None)
-        st.dataframe(styled_rate, use_container_width=True)
-        
-        csv_rate = pivot_rate.to_csv()
-        st.download_button(
-            label="📥 Download Fulfillment Rate as CSV",
-            data=csv_rate,
-            file_name="fulfillment_rate.csv",
-            mime="text/csv",
-            key="download_fulfillment_rate"
-        )
-        
-        # Onsite Demands Tables
-        st.markdown("---")
-        st.header("🏢 Onsite Fulfillment Metrics by Business Unit")
-        
-        df_business_onsite = create_fulfillment_location_business_dataframe(fulfillment_data, 'onsite')
-        
-        # Onsite Total Demands
-        st.subheader("📊 Onsite Total Demands by Business")
-        pivot_onsite_total = create_fulfillment_pivot(df_business_onsite, 'Total', 'Onsite Total Demands', fulfillment_data, 'onsite')
-        styled_onsite_total = pivot_onsite_total.style.format("{:.0f}")
-        styled_onsite_total = styled_onsite_total.apply(lambda x: highlight_fulfillment_table(pivot_onsite_total), axis=None)
-        st.dataframe(styled_onsite_total, use_container_width=True)
-        
-        csv_onsite_total = pivot_onsite_total.to_csv()
-        st.download_button(
-            label="📥 Download Onsite Total Demands as CSV",
-            data=csv_onsite_total,
-            file_name="fulfillment_onsite_total_demands.csv",
-            mime="text/csv",
-            key="download_onsite_total"
-        )
-        
-        # Onsite Filled Demands
-        st.markdown("---")
-        st.subheader("✅ Onsite Filled Demands by Business")
-        pivot_onsite_filled = create_fulfillment_pivot(df_business_onsite, 'Filled', 'Onsite Filled Demands', fulfillment_data, 'onsite')
-        styled_onsite_filled = pivot_onsite_filled.style.format("{:.0f}")
-        styled_onsite_filled = styled_onsite_filled.apply(lambda x: highlight_fulfillment_table(pivot_onsite_filled), axis=None)
-        st.dataframe(styled_onsite_filled, use_container_width=True)
-        
-        csv_onsite_filled = pivot_onsite_filled.to_csv()
-        st.download_button(
-            label="📥 Download Onsite Filled Demands as CSV",
-            data=csv_onsite_filled,
-            file_name="fulfillment_onsite_filled_demands.csv",
-            mime="text/csv",
-            key="download_onsite_filled"
-        )
-        
-        # Onsite Open Demands
-        st.markdown("---")
-        st.subheader("⏳ Onsite Open Demands by Business")
-        pivot_onsite_open = create_fulfillment_pivot(df_business_onsite, 'Open', 'Onsite Open Demands', fulfillment_data, 'onsite')
-        styled_onsite_open = pivot_onsite_open.style.format("{:.0f}")
-        styled_onsite_open = styled_onsite_open.apply(lambda x: highlight_fulfillment_table(pivot_onsite_open), axis=None)
-        st.dataframe(styled_onsite_open, use_container_width=True)
-        
-        csv_onsite_open = pivot_onsite_open.to_csv()
-        st.download_button(
-            label="📥 Download Onsite Open Demands as CSV",
-            data=csv_onsite_open,
-            file_name="fulfillment_onsite_open_demands.csv",
-            mime="text/csv",
-            key="download_onsite_open"
-        )
-        
-        # Offshore Demands Tables
-        st.markdown("---")
-        st.header("🌍 Offshore Fulfillment Metrics by Business Unit")
-        
-        df_business_offshore = create_fulfillment_location_business_dataframe(fulfillment_data, 'offshore')
-        
-        # Offshore Total Demands
-        st.subheader("📊 Offshore Total Demands by Business")
-        pivot_offshore_total = create_fulfillment_pivot(df_business_offshore, 'Total', 'Offshore Total Demands', fulfillment_data)
-        styled_offshore_total = pivot_offshore_total.style.format("{:.0f}")
-        styled_offshore_total = styled_offshore_total.apply(lambda x: highlight_fulfillment_table(pivot_offshore_total), axis=None)
-        st.dataframe(styled_offshore_total, use_container_width=True)
-        
-        csv_offshore_total = pivot_offshore_total.to_csv()
-        st.download_button(
-            label="📥 Download Offshore Total Demands as CSV",
-            data=csv_offshore_total,
-            file_name="fulfillment_offshore_total_demands.csv",
-            mime="text/csv",
-            key="download_offshore_total"
-        )
-        
-        # Offshore Filled Demands
-        st.markdown("---")
-        st.subheader("✅ Offshore Filled Demands by Business")
-        pivot_offshore_filled = create_fulfillment_pivot(df_business_offshore, 'Filled', 'Offshore Filled Demands', fulfillment_data)
-        styled_offshore_filled = pivot_offshore_filled.style.format("{:.0f}")
-        styled_offshore_filled = styled_offshore_filled.apply(lambda x: highlight_fulfillment_table(pivot_offshore_filled), axis=None)
-        st.dataframe(styled_offshore_filled, use_container_width=True)
-        
-        csv_offshore_filled = pivot_offshore_filled.to_csv()
-        st.download_button(
-            label="📥 Download Offshore Filled Demands as CSV",
-            data=csv_offshore_filled,
-            file_name="fulfillment_offshore_filled_demands.csv",
-            mime="text/csv",
-            key="download_offshore_filled"
-        )
-        
-        # Offshore Open Demands
-        st.markdown("---")
-        st.subheader("⏳ Offshore Open Demands by Business")
-        pivot_offshore_open = create_fulfillment_pivot(df_business_offshore, 'Open', 'Offshore Open Demands', fulfillment_data)
-        styled_offshore_open = pivot_offshore_open.style.format("{:.0f}")
-        styled_offshore_open = styled_offshore_open.apply(lambda x: highlight_fulfillment_table(pivot_offshore_open), axis=None)
-        st.dataframe(styled_offshore_open, use_container_width=True)
-        
-        csv_offshore_open = pivot_offshore_open.to_csv()
-        st.download_button(
-            label="📥 Download Offshore Open Demands as CSV",
-            data=csv_offshore_open,
-            file_name="fulfillment_offshore_open_demands.csv",
-            mime="text/csv",
-            key="download_offshore_open"
-        )
+        if overall_tab.open:
+            with overall_tab:
+                fulfillment_pivots = build_all_fulfillment_pivots(df_business_fulfillment, fulfillment_data, fulfillment_mtime)
+                
+                # Total / Filled / Open demands, then the fulfillment rate
+                for metric_col, icon, title, slug in DEMAND_SECTIONS:
+                    pivot_section(
+                        fulfillment_pivots[metric_col],
+                        title=f"{icon} {title} by Business",
+                        number_format=COLUMN_FMT_INT,
+                        download_label=f"📥 Download {title} as CSV",
+                        file_name=f"fulfillment_{slug}_demands.csv",
+                        key=f"download_{slug}_demands"
+                    )
+                    st.markdown("---")
+                
+                pivot_section(
+                    fulfillment_pivots['Fulfillment_Rate'],
+                    title="📊 Fulfillment Rate (%) by Business",
+                    number_format=COLUMN_FMT_FLOAT,
+                    download_label="📥 Download Fulfillment Rate as CSV",
+                    file_name="fulfillment_rate.csv",
+                    key="download_fulfillment_rate"
+                )
+        
+        for location_tab, table_title in ((onsite_tab, 'Onsite'), (offshore_tab, 'Offshore')):
+            if not location_tab.open:
+                continue
+            with location_tab:
+                location = table_title.lower()
+                st.header(f"{LOCATION_ICONS[table_title]} {table_title} Fulfillment Metrics by Business Unit")
+                
+                location_pivots = build_all_fulfillment_pivots(
+                    fulfillment_tables['fulfillment', location], fulfillment_data, fulfillment_mtime, location
+                )
+                
+                # One sub-tab per demand status; only the selected one is styled and sent
+                # (stateful tabs - key/on_change/.open - need the Streamlit 1.55.0 floor in requirements.txt)
+                status_tabs = st.tabs(
+                    [f"{icon} {metric_col}" for metric_col, icon, _, _ in DEMAND_SECTIONS],
+                    key=f"{location}_demand_tab", on_change="rerun"
+                )
+                for status_tab, (metric_col, icon, title, slug) in zip(status_tabs, DEMAND_SECTIONS):
+                    if not status_tab.open:
+                        continue
+                    with status_tab:
+                        pivot_section(
+                            location_pivots[metric_col],
+                            title=f"{icon} {table_title} {title} by Business",
+                            number_format=COLUMN_FMT_INT,
+                            download_label=f"📥 Download {table_title} {title} as CSV",
+                            file_name=f"fulfillment_{location}_{slug}_demands.csv",
+                            key=f"download_{location}_{slug}"
+                        )
     
     # Footer
     st.markdown("---")
-    st.markdown("""
-    <div style='text-align: center; color: #666; padding: 20px;'>
-        <p>COO Dashboard - Workforce Metrics Analytics  </p>
-        <p>Built with Streamlit • Data updated: {}</p>
-    </div>
-    """.format(data[0]['extraction_date']), unsafe_allow_html=True)
+    st.markdown(footer_html(extraction_date), unsafe_allow_html=True)
 
 
 if __name__ == "__main__":